@@ -38,6 +38,112 @@ COLORS = ["black", "red", "green", "blue", "violet", "orange",
 # COLORS = ["black", "blue", "#f57900", "(.0, .6, .0)", "red"]
 
 
+def _energy_step(index):
+    """ Return the energy step of a regularly spaced energy grid """
+    steps = np.diff(np.asarray(index, dtype=np.float64))
+    if steps.size == 0 or not np.allclose(steps, steps[0], rtol=1e-3):
+        raise ValueError("The energy grid must be regularly spaced")
+    return steps[0]
+
+
+def _savgol_filter(data, window, polyorder, deriv=0, delta=1.):
+    """
+    Savitzky-Golay filter applied along the first axis of a 2D array. All
+    columns are filtered at once: the central part is a convolution of the
+    sliding windows with the filter coefficients and the edges are computed
+    from the polynomial fitted on the first and last windows.
+
+    Args:
+        data (ndarray): array of shape (n_energies, n_columns)
+        window (int): odd number of points of the filter window
+        polyorder (int): order of the polynomial, lower than window
+        deriv (int): order of the derivative, 0 means smoothing only
+        delta (float): energy step used to scale the derivatives
+
+    Returns:
+        An array of the same shape as data.
+    """
+    if not isinstance(window, (int, np.integer)) or \
+            not isinstance(polyorder, (int, np.integer)):
+        raise ValueError("window and polyorder must be integers")
+    if not isinstance(deriv, (int, np.integer)) or deriv < 0:
+        raise ValueError("deriv must be a positive or null integer")
+    if window % 2 != 1 or window < 1:
+        raise ValueError("window must be a positive odd integer")
+    if polyorder >= window:
+        raise ValueError("polyorder must be less than window")
+    if deriv > polyorder:
+        raise ValueError("deriv must be less than or equal to polyorder")
+    npts = data.shape[0]
+    if window > npts:
+        raise ValueError("window is larger than the number of data points")
+
+    # least square fit of a polynomial on a window: M[i] gives the value of
+    # the deriv-th derivative at the i-th point of the window
+    half = window // 2
+    x = np.arange(-half, half + 1, dtype=np.float64)
+    powers = np.arange(polyorder + 1)
+    vander = x[:, np.newaxis] ** powers
+    factors = np.array([np.prod(np.arange(p - deriv + 1, p + 1)) if p >= deriv
+                        else 0. for p in powers])
+    dvander = factors * x[:, np.newaxis] ** np.clip(powers - deriv, 0, None)
+    M = dvander @ np.linalg.pinv(vander)
+
+    filtered = np.empty(data.shape, dtype=np.float64)
+    windows = np.lib.stride_tricks.sliding_window_view(data, window, axis=0)
+    filtered[half:npts - half] = windows @ M[half]
+    filtered[:half] = M[:half] @ data[:window]
+    filtered[npts - half:] = M[half + 1:] @ data[npts - window:]
+
+    return filtered / delta ** deriv
+
+
+def _column_list(columns):
+    """ Return columns as a list, a single column name being allowed """
+    if isinstance(columns, str):
+        return [columns]
+    return list(columns)
+
+
+def _check_columns(xps_list, columns):
+    """ Raise NameError if a column is missing in one of the XPSData """
+    for xps in xps_list:
+        for c in columns:
+            if c not in xps.data.columns:
+                raise NameError("'{}' is not an existing column. ".format(c) +
+                                "Try list_columns()")
+
+
+def _savgol_columns(xps_list, columns, window, polyorder, deriv, suffix):
+    """
+    Apply the Savitzky-Golay filter to the given columns of all XPSData
+    objects. Data sharing the same energy grid are filtered together as a
+    single array. Results are stored in new columns named column_suffix.
+    """
+    _check_columns(xps_list, columns)
+
+    # gather data with identical energy grids
+    groups = []
+    for xps in xps_list:
+        for group in groups:
+            if np.array_equal(group[0].data.index, xps.data.index):
+                group.append(xps)
+                break
+        else:
+            groups.append([xps])
+
+    ncol = len(columns)
+    for group in groups:
+        delta = _energy_step(group[0].data.index)
+        block = np.hstack([xps.data[columns].values for xps in group])
+        filtered = _savgol_filter(block, window, polyorder, deriv, delta)
+        for i, xps in enumerate(group):
+            for j, c in enumerate(columns):
+                name = "{}_{}".format(c, suffix)
+                xps.data[name] = filtered[:, i * ncol + j]
+                xps._derived[name] = "deriv" if deriv else "smooth"
+
+
 class XPSData(object):
     """ Manage XPS Data """
 
@@ -53,6 +159,9 @@ class XPSData(object):
         self.source = source
         self.filename = filename
         self._to_plot = []
+        # kind ("smooth", "deriv" or "diff") of the columns computed by
+        # smooth, derivative or difference
+        self._derived = dict()
 
     def list_columns(self, to_print=True):
         """ print names of component in data """
@@ -82,6 +191,8 @@ class XPSData(object):
                             "Try list_columns()")
         else:
             self.data.rename(columns={oldname: newname}, inplace=True)
+            if oldname in self._derived:
+                self._derived[newname] = self._derived.pop(oldname)
 
     def set_column_names_interac(self):
         """ Rename column name interactively """
@@ -105,7 +216,8 @@ class XPSData(object):
         """
         Substract background column to all data columns. If from_file was used
         the background column is called 'BG'. A different column name can be
-        given as an optional argument.
+        given as an optional argument. Columns computed by derivative() or
+        difference() are left unchanged.
 
         Args:
             bg (str): background column name, default is "BG"
@@ -115,11 +227,14 @@ class XPSData(object):
                             "Try list_columns()")
         bg_data = self.data[bg].copy()
         for col in self.data.columns:
-            self.data[col] -= bg_data
+            if self._derived.get(col, "smooth") == "smooth":
+                self.data[col] -= bg_data
 
     def normalize(self, BE="Exp", method="minmax"):
         """
         Normalize data by dividing all components by the max value of the data.
+        Columns computed by derivative() or difference() are only divided by
+        the range of the data, without offset.
 
         Args:
             BE (str): Column name to use in order to compute the normalization factor
@@ -132,7 +247,79 @@ class XPSData(object):
         maxBE = self.data[BE].max()
 
         for col in self.data.columns:
-            self.data[col] = (self.data[col] - minBE) / (maxBE - minBE)
+            if self._derived.get(col, "smooth") == "smooth":
+                self.data[col] = (self.data[col] - minBE) / (maxBE - minBE)
+            else:
+                self.data[col] = self.data[col] / (maxBE - minBE)
+
+    def smooth(self, columns=["Exp"], window=11, polyorder=3, suffix="smooth"):
+        """
+        Smooth data columns using a Savitzky-Golay filter. Results are stored
+        in new columns named column_suffix, for example "Exp_smooth", which
+        can be given to get_plot(). The energy grid must be regularly spaced.
+
+        Args:
+            columns (list): names of the columns to smooth, default is ["Exp"]
+            window (int): odd number of points of the filter window
+            polyorder (int): order of the fitted polynomial
+            suffix (str): suffix of the new column names
+        """
+        columns = _column_list(columns)
+        _savgol_columns([self], columns, window, polyorder, 0, suffix)
+
+    def derivative(self, columns=["Exp"], order=1, window=11, polyorder=3,
+                   suffix=None):
+        """
+        Compute the derivative of data columns with respect to the binding
+        energy using a Savitzky-Golay filter. Results are stored in new
+        columns named column_suffix, the default suffix being "d1" for the
+        first derivative, "d2" for the second derivative ...
+
+        Args:
+            columns (list): names of the columns to derive, default is ["Exp"]
+            order (int): order of the derivative, at least 1
+            window (int): odd number of points of the filter window
+            polyorder (int): order of the fitted polynomial, at least order
+            suffix (str): suffix of the new column names
+        """
+        if not isinstance(order, (int, np.integer)) or order < 1:
+            raise ValueError("order must be an integer greater than 0")
+        if suffix is None:
+            suffix = "d{}".format(order)
+        columns = _column_list(columns)
+        _savgol_columns([self], columns, window, polyorder, order, suffix)
+
+    def difference(self, other, columns=["Exp"], suffix="diff"):
+        """
+        Compute the difference between data columns and the same columns of
+        an other XPSData object. If the energy grids are not the same, the
+        data of other are linearly interpolated on the energy grid of this
+        object and the difference is only computed on the overlapping energy
+        range, NaN being set outside. Results are stored in new columns named
+        column_suffix.
+
+        Args:
+            other (XPSData): the data to substract
+            columns (list): names of the columns, default is ["Exp"]
+            suffix (str): suffix of the new column names
+        """
+        columns = _column_list(columns)
+        _check_columns([self, other], columns)
+
+        if np.array_equal(self.data.index, other.data.index):
+            other_data = other.data[columns].values
+        else:
+            other_sorted = other.data[columns].sort_index()
+            other_data = np.column_stack([
+                np.interp(self.data.index, other_sorted.index, other_sorted[c],
+                          left=np.nan, right=np.nan)
+                for c in columns])
+
+        diff = self.data[columns].values - other_data
+        for j, c in enumerate(columns):
+            name = "{}_{}".format(c, suffix)
+            self.data[name] = diff[:, j]
+            self._derived[name] = "diff"
 
     def get_plot(self, columns=None, fill=False, ax=None, xaxes=True,
                  legend=True, colors=COLORS, ylabel=None, frame=False,
@@ -361,6 +548,79 @@ class StackedXPSData(object):
         for xpsData in self.xpsData:
             xpsData.normalize(BE)
 
+    def smooth(self, columns=["Exp"], window=11, polyorder=3, suffix="smooth"):
+        """
+        Smooth data columns of all xpsData objects using a Savitzky-Golay
+        filter. Data sharing the same energy grid are smoothed in one shot.
+        Results are stored in new columns named column_suffix.
+
+        Args:
+            columns (list): names of the columns to smooth, default is ["Exp"]
+            window (int): odd number of points of the filter window
+            polyorder (int): order of the fitted polynomial
+            suffix (str): suffix of the new column names
+        """
+        columns = _column_list(columns)
+        _savgol_columns(self.xpsData, columns, window, polyorder, 0, suffix)
+
+    def derivative(self, columns=["Exp"], order=1, window=11, polyorder=3,
+                   suffix=None):
+        """
+        Compute the derivative of data columns of all xpsData objects with
+        respect to the binding energy using a Savitzky-Golay filter. Results
+        are stored in new columns named column_suffix, the default suffix
+        being "d1" for the first derivative, "d2" for the second derivative ...
+
+        Args:
+            columns (list): names of the columns to derive, default is ["Exp"]
+            order (int): order of the derivative, at least 1
+            window (int): odd number of points of the filter window
+            polyorder (int): order of the fitted polynomial, at least order
+            suffix (str): suffix of the new column names
+        """
+        if not isinstance(order, (int, np.integer)) or order < 1:
+            raise ValueError("order must be an integer greater than 0")
+        if suffix is None:
+            suffix = "d{}".format(order)
+        columns = _column_list(columns)
+        _savgol_columns(self.xpsData, columns, window, polyorder, order,
+                        suffix)
+
+    def difference(self, reference=0, columns=["Exp"], suffix="diff"):
+        """
+        Compute difference spectra. Each xpsData object is compared either to
+        a reference xpsData object or to the previous one. Results are stored
+        in new columns named column_suffix.
+
+        Args:
+            reference: index of the reference xpsData object, default is the
+                       first one. If "previous", the difference is computed
+                       with the previous xpsData object and the columns of
+                       the first one are set to NaN.
+            columns (list): names of the columns, default is ["Exp"]
+            suffix (str): suffix of the new column names
+        """
+        columns = _column_list(columns)
+        if reference == "previous":
+            _check_columns(self.xpsData, columns)
+            first = self.xpsData[0]
+            for xps, prev in zip(self.xpsData[1:], self.xpsData[:-1]):
+                xps.difference(prev, columns, suffix)
+            for c in columns:
+                name = "{}_{}".format(c, suffix)
+                first.data[name] = np.nan
+                first._derived[name] = "diff"
+        else:
+            nxps = len(self.xpsData)
+            if isinstance(reference, bool) or \
+                    not isinstance(reference, (int, np.integer)) or \
+                    not -nxps <= reference < nxps:
+                raise ValueError("reference must be 'previous' or an index "
+                                 "between {} and {}".format(-nxps, nxps - 1))
+            ref = self.xpsData[reference]
+            for xps in self.xpsData:
+                xps.difference(ref, columns, suffix)
+
     def get_plot(self, columns=None, fill=False, legend=True, ylabel=None,
                  pos=[], colors=COLORS, legend_kws={}):
         """